@@ -0,0 +1,63 @@
+"""
+TradeSenpai — Prediction Micro-Batcher
+========================================
+Coalesces concurrent /predict calls for the same ticker into a single
+batched transformer forward pass. Each caller awaits a future; a drain
+task per ticker collects up to MAX_BATCH_SIZE requests (waiting at most
+MAX_LATENCY_MS for stragglers) and runs one Predictor.predict_many.
+"""
+
+import asyncio
+
+MAX_BATCH_SIZE = 16
+MAX_LATENCY_MS = 20
+
+
+class PredictionBatcher:
+    def __init__(self, predictor):
+        self._predictor = predictor
+        self._queues:   dict[str, asyncio.Queue] = {}
+        self._drainers: dict[str, asyncio.Task]  = {}
+
+    async def predict(self, ticker: str, feature_df) -> dict:
+        loop   = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        queue = self._queues.get(ticker)
+        if queue is None:
+            queue = self._queues[ticker] = asyncio.Queue()
+        await queue.put((feature_df, future))
+
+        if ticker not in self._drainers or self._drainers[ticker].done():
+            self._drainers[ticker] = asyncio.create_task(self._drain(ticker))
+
+        return await future
+
+    async def _drain(self, ticker: str):
+        queue = self._queues[ticker]
+        while not queue.empty():
+            batch = [await queue.get()]
+
+            # Wait briefly for stragglers to fill the batch
+            deadline = asyncio.get_running_loop().time() + MAX_LATENCY_MS / 1000
+            while len(batch) < MAX_BATCH_SIZE:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            feature_dfs = [df for df, _ in batch]
+            try:
+                results = await asyncio.to_thread(
+                    self._predictor.predict_many, ticker, feature_dfs
+                )
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
@@ -1,12 +1,17 @@
 import sys, os, json, re
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
+import orjson
+
 from groq import Groq
 from dotenv import load_dotenv
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# Salvage pattern for _parse_json — compiled once, not per failed parse
+_SALVAGE_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 TICKER_FULL_NAME = {
     "KO":    "Coca-Cola",
     "JNJ":   "Johnson & Johnson",
@@ -16,15 +21,60 @@ TICKER_FULL_NAME = {
     "GOOGL": "Alphabet (Google)",
 }
 
+class IncrementalJsonParser:
+    """
+    Feeds streamed LLM chunks and returns the parsed brief as soon as the
+    top-level JSON object closes — no waiting on trailing whitespace/newlines
+    the model may still be decoding.
+    """
+
+    def __init__(self):
+        self._parts    = []
+        self._depth    = 0
+        self._in_str   = False
+        self._escaped  = False
+        self._started  = False
+
+    def feed(self, delta: str) -> dict | None:
+        """Consume one stream chunk. Returns the dict once complete, else None."""
+        for ch in delta:
+            if self._started:
+                self._parts.append(ch)
+            if self._escaped:
+                self._escaped = False
+                continue
+            if ch == "\\" and self._in_str:
+                self._escaped = True
+                continue
+            if ch == '"':
+                self._in_str = not self._in_str
+                continue
+            if self._in_str:
+                continue
+            if ch == "{":
+                if not self._started:
+                    self._started = True
+                    self._parts.append(ch)
+                self._depth += 1
+            elif ch == "}" and self._started:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        return orjson.loads("".join(self._parts))
+                    except Exception:
+                        return None
+        return None
+
+
 def _parse_json(raw: str) -> dict:
     try:
-        return json.loads(raw)
+        return orjson.loads(raw)
     except Exception:
         # Try to find and parse the largest complete JSON object
-        match = re.search(r"\{.*\}", raw, re.DOTALL)
+        match = _SALVAGE_RE.search(raw)
         if match:
             try:
-                return json.loads(match.group())
+                return orjson.loads(match.group())
             except Exception:
                 # JSON truncated — try to salvage by closing open brackets
                 text = match.group()
@@ -33,7 +83,7 @@ def _parse_json(raw: str) -> dict:
                 open_brackets = text.count("[") - text.count("]")
                 text += "]" * open_brackets + "}" * open_braces
                 try:
-                    return json.loads(text)
+                    return orjson.loads(text)
                 except Exception:
                     pass
     return {}
@@ -186,8 +236,8 @@ Write a research brief. Return ONLY valid JSON, no markdown:
     "base_rate_for_implied": {br.get('base_rate_for_implied')},
     "max_historical_move": {br.get('max_gain_in_timeframe')}
   }},
-  "bull_case": {json.dumps(bull.get('catalysts', []))},
-  "bear_case": {json.dumps(bear.get('risks', []))},
+  "bull_case": {orjson.dumps(bull.get('catalysts', [])).decode()},
+  "bear_case": {orjson.dumps(bear.get('risks', [])).decode()},
   "parameters_to_monitor": [
     {{"param": "RSI", "current": {signals.get('rsi_14')}, "watch_for": "crosses above 70 (overbought) or below 30 (oversold)"}},
     {{"param": "MA20", "current": {signals.get('ma_20')}, "watch_for": "price breaks below MA20 invalidates bullish setup"}},
@@ -220,14 +270,31 @@ def synthesize(
 
     try:
         client = Groq(api_key=GROQ_API_KEY)
-        response = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=2000,
             temperature=0.2,
+            stream=True,
         )
-        raw = response.choices[0].message.content.strip()
-        brief = _parse_json(raw)
+
+        # Parse incrementally and stop as soon as the top-level object closes —
+        # overlaps server decode with client parse instead of waiting for EOS.
+        parser = IncrementalJsonParser()
+        chunks = []
+        brief  = None
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content or ""
+            chunks.append(delta)
+            brief = parser.feed(delta)
+            if brief is not None:
+                stream.close()
+                break
+
+        raw = "".join(chunks).strip()
+        if brief is None:
+            # Stream ended without a closed object — salvage what we got
+            brief = _parse_json(raw)
 
         if not brief:
             print(f"[WARN][synthesizer] JSON parse failed, returning raw text")
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Query, Depends, Request
+from fastapi import FastAPI, HTTPException, Query, Depends, Request, Response, BackgroundTasks
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -6,20 +6,47 @@ from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime, timedelta
 import pandas as pd
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from explainer import explain_prediction
 from alerts.scheduler import create_scheduler
 from alerts.bot_listener import create_bot_app
 import threading
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from auth import require_admin
+import asyncio
+import hashlib
+import httpx
 import json
+import time
+import logging
 import os
+import traceback
 from pathlib import Path
 import ast
 from edgar_fetcher import get_recent_filings, get_highlighted_filing
+from collections import defaultdict
+from cachetools import TTLCache
+import torch
 load_dotenv()
 
+# libuv-backed event loop — uvicorn also picks up httptools for HTTP
+# parsing once installed. POSIX-only, so local Windows dev still works.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+# Pin BLAS threads per worker — PyTorch defaults to num_cpus threads in
+# every worker, which oversubscribes cores under a multi-worker deploy.
+# Set TORCH_THREADS (and OMP_NUM_THREADS in the deploy config) to
+# roughly cores / workers.
+torch.set_num_threads(int(os.getenv("TORCH_THREADS", "2")))
+torch.set_num_interop_threads(1)
+
+log = logging.getLogger("tradesenpai.api")
+
 from models import (
     PredictionResponse, PriceHistoryResponse,
     SentimentHistoryResponse, ModelInfoResponse,
@@ -32,6 +59,7 @@ from alerts.alert_store import (
 )
 
 from predictor import Predictor
+from batcher import PredictionBatcher
 from feature_engineer import get_latest_feature_row, fetch_recent_prices
 from sentiment_loader import load_sentiment_history, load_latest_sentiment
 from hypothesis.hypothesis_parser import parse_hypothesis
@@ -43,15 +71,25 @@ from hypothesis.synthesizer       import synthesize, TICKER_FULL_NAME
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Preload models
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+    )
+
+    # Preload models — torch.load releases the GIL during file reads, so
+    # the six checkpoints load concurrently instead of back-to-back
     print("[STARTUP] Preloading all ticker models...")
-    for ticker in SUPPORTED_TICKERS:
+
+    def preload(ticker):
         try:
-            predictor._load_model(ticker)
+            predictor.warmup(ticker)
             print(f"[STARTUP] {ticker} model ready")
         except Exception as e:
             print(f"[STARTUP] Could not load {ticker}: {e}")
 
+    with ThreadPoolExecutor(max_workers=len(SUPPORTED_TICKERS)) as pool:
+        list(pool.map(preload, SUPPORTED_TICKERS))
+
     # Start alert scheduler
     scheduler = create_scheduler()
     scheduler.start()
@@ -77,18 +115,26 @@ async def lifespan(app: FastAPI):
     scheduler.shutdown(wait=False)
     print("[SHUTDOWN] Scheduler stopped")
 
-app = FastAPI(title="TradeSenpai API v2", version="2.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="TradeSenpai API v2",
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 predictor = Predictor()
+batcher   = PredictionBatcher(predictor)
 
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
-# Cache per ticker
-_cache: dict = {}
+# Cache per ticker — TTLCache expires on a monotonic clock (immune to
+# NTP jumps); per-ticker locks single-flight concurrent misses
 CACHE_TTL_MINUTES = 30
+_cache: TTLCache = TTLCache(maxsize=32, ttl=CACHE_TTL_MINUTES * 60, timer=time.monotonic)
+_cache_locks: defaultdict = defaultdict(asyncio.Lock)
 
 app.add_middleware(
     CORSMiddleware,
@@ -108,9 +154,76 @@ TICKER_NAMES = {
 }
 
 
+# Persistent client for Telegram welcome messages — reuses the TLS
+# connection instead of a fresh Bot + event loop per subscriber
+_tg_client = httpx.AsyncClient(timeout=5)
+
+WELCOME_BODY = (
+    "You'll now receive:\n"
+    "• 🌅 Morning brief (9:30 AM ET)\n"
+    "• 🌆 Evening outcomes (4:15 PM ET)\n"
+    "• 🔄 Direction flip alerts\n"
+    "• 📄 Sentiment spike alerts\n\n"
+    "⚠️ <i>Educational simulation only. Not financial advice.</i>"
+)
+
+
+def _log_prediction_safe(**kwargs):
+    try:
+        from alerts.alert_store import log_prediction
+        log_prediction(**kwargs)
+    except Exception as e:
+        log.warning("Could not log prediction for %s: %s", kwargs.get("ticker"), e)
+
+
+# The event loop only holds weak references to tasks — a fire-and-forget
+# create_task result can be garbage-collected before it runs. Keep them
+# alive here until done
+_bg_tasks: set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_tasks.discard)
+    return task
+
+
+async def send_welcome(telegram_id: str, headline: str):
+    token = os.getenv("TELEGRAM_BOT_TOKEN")
+    try:
+        await _tg_client.post(
+            f"https://api.telegram.org/bot{token}/sendMessage",
+            json={
+                "chat_id":    telegram_id,
+                "text":       f"🤖 <b>TradeSenpai Alerts — {headline}</b>\n\n{WELCOME_BODY}",
+                "parse_mode": "HTML",
+            },
+        )
+    except Exception as e:
+        log.warning("Welcome message failed: %s", e)
+
+
+SUPPORTED_TICKERS_SET = frozenset(SUPPORTED_TICKERS)
+
+
+def _check_etag(request: Request, response: Response, key: str):
+    """
+    Conditional-GET helper for once-a-day data. Returns a 304 Response if
+    the client already holds the current version, else stamps ETag +
+    Cache-Control on the outgoing response and returns None.
+    """
+    etag = hashlib.md5(key.encode()).hexdigest()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "max-age=300"
+    return None
+
+
 def validate_ticker(ticker: str) -> str:
     ticker = ticker.upper()
-    if ticker not in SUPPORTED_TICKERS:
+    if ticker not in SUPPORTED_TICKERS_SET:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported ticker '{ticker}'. Supported: {SUPPORTED_TICKERS}"
@@ -124,132 +237,132 @@ def health():
         "status":   "ok",
         "version":  "2.0.0",
         "tickers":  SUPPORTED_TICKERS,
-        "timestamp": str(datetime.now())
+        "timestamp": datetime.now().isoformat(timespec="seconds")
     }
 
 
 @app.get("/predict", response_model=PredictionResponse)
-def predict(ticker: str = Query(default="KO")):
+async def predict(background_tasks: BackgroundTasks, ticker: str = Query(default="KO")):
     ticker = validate_ticker(ticker)
     try:
-        now = datetime.now()
-        if (
-            ticker in _cache and
-            _cache[ticker].get("timestamp") and
-            (now - _cache[ticker]["timestamp"]).seconds < CACHE_TTL_MINUTES * 60
-        ):
-            print(f"[INFO] Returning cached prediction for {ticker}")
-            return _cache[ticker]["prediction"]
-
-        feature_df, price_df = get_latest_feature_row(ticker)
-        print(f"[DEBUG] feature_df shape in main: {feature_df.shape}")
-        result    = predictor.predict(ticker, feature_df)
-        sentiment = load_latest_sentiment(ticker)
-
-        last_date = pd.to_datetime(price_df["date"].iloc[-1])
-        next_day  = last_date + timedelta(days=1)
-
-        response = PredictionResponse(
-            ticker          = ticker,
-            name            = TICKER_NAMES.get(ticker, ticker),
-            prediction      = result["prediction"],
-            confidence      = result["confidence"],
-            predicted_date  = str(next_day.date()),
-            as_of_date      = str(last_date.date()),
-            top_signals     = result["top_signals"],
-            sentiment_score = sentiment["lm_sentiment_score"],
-            sentiment_label = "Positive" if sentiment["lm_sentiment_score"] > 0.5
-                              else ("Negative" if sentiment["lm_sentiment_score"] < -0.5
-                              else "Neutral"),
-            model_accuracy  = result["cv_accuracy"],
-        )
+        async with _cache_locks[ticker]:
+            cached = _cache.get(ticker)
+            if cached is not None:
+                log.debug("Returning cached prediction for %s", ticker)
+                return cached
+
+            feature_df, price_df = await asyncio.to_thread(get_latest_feature_row, ticker)
+            log.debug("feature_df shape in main: %s", feature_df.shape)
+            result    = await batcher.predict(ticker, feature_df)
+            sentiment = await asyncio.to_thread(load_latest_sentiment, ticker)
+
+            last_date = pd.to_datetime(price_df["date"].iloc[-1])
+            next_day  = last_date + timedelta(days=1)
+
+            response = PredictionResponse(
+                ticker          = ticker,
+                name            = TICKER_NAMES.get(ticker, ticker),
+                prediction      = result["prediction"],
+                confidence      = result["confidence"],
+                predicted_date  = str(next_day.date()),
+                as_of_date      = str(last_date.date()),
+                top_signals     = result["top_signals"],
+                sentiment_score = sentiment["lm_sentiment_score"],
+                sentiment_label = "Positive" if sentiment["lm_sentiment_score"] > 0.5
+                                  else ("Negative" if sentiment["lm_sentiment_score"] < -0.5
+                                  else "Neutral"),
+                model_accuracy  = result["cv_accuracy"],
+            )
 
-        _cache[ticker] = {"prediction": response, "timestamp": now}
+            _cache[ticker] = response
 
-        # Log prediction to history (skip if cached — already logged)
-        try:
-            from alerts.alert_store import log_prediction
-            log_prediction(
+            # Log prediction to history after the response is sent —
+            # keeps the DB round-trip off the critical path
+            background_tasks.add_task(
+                _log_prediction_safe,
                 ticker         = ticker,
                 predicted_date = str(next_day.date()),
                 prediction     = result["prediction"],
                 confidence     = result["confidence"],
             )
-        except Exception as e:
-            print(f"[WARN] Could not log prediction for {ticker}: {e}")
 
-        return response
+            return response
 
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("predict failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
 @app.get("/price-history", response_model=PriceHistoryResponse)
-def price_history(ticker: str = Query(default="KO")):
+async def price_history(request: Request, response: Response, ticker: str = Query(default="KO")):
     ticker = validate_ticker(ticker)
     try:
-        df = fetch_recent_prices(ticker, days=100)
-        df = df.tail(90)
+        df = await asyncio.to_thread(fetch_recent_prices, ticker, days=100)
+        # Bars change once per trading day — short-circuit repeat pollers
+        # with a 304 before the columnar rebuild below
+        not_modified = _check_etag(request, response, f"{ticker}:{df['date'].iloc[-1]}")
+        if not_modified is not None:
+            return not_modified
+        # Columnar slice — skip the intermediate tail(90) DataFrame and
+        # per-row Series materialization entirely
+        dates   = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d").to_numpy()[-90:]
+        opens   = df["open"].to_numpy()[-90:].round(2)
+        highs   = df["high"].to_numpy()[-90:].round(2)
+        lows    = df["low"].to_numpy()[-90:].round(2)
+        closes  = df["close"].to_numpy()[-90:].round(2)
+        volumes = df["volume"].to_numpy()[-90:].round(0)
         return PriceHistoryResponse(
             ticker=ticker,
             data=[
-                PricePoint(
-                    date   = str(row["date"].date()),
-                    open   = round(float(row["open"]),   2),
-                    high   = round(float(row["high"]),   2),
-                    low    = round(float(row["low"]),    2),
-                    close  = round(float(row["close"]),  2),
-                    volume = round(float(row["volume"]), 0),
-                )
-                for _, row in df.iterrows()
+                PricePoint.model_construct(date=d, open=o, high=h, low=l, close=c, volume=v)
+                for d, o, h, l, c, v in zip(dates, opens, highs, lows, closes, volumes)
             ]
         )
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("price_history failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
 @app.get("/sentiment-history", response_model=SentimentHistoryResponse)
-def sentiment_history(ticker: str = Query(default="KO")):
+async def sentiment_history(ticker: str = Query(default="KO")):
     ticker = validate_ticker(ticker)
     try:
-        data = load_sentiment_history(ticker, n=50)
+        data = await asyncio.to_thread(load_sentiment_history, ticker, n=50)
         return SentimentHistoryResponse(
             ticker=ticker,
-            data=[SentimentPoint(**d) for d in data]
+            data=[SentimentPoint.model_construct(**d) for d in data]
         )
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("sentiment_history failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
 @app.get("/model-info", response_model=ModelInfoResponse)
-def model_info(ticker: str = Query(default="KO")):
+def model_info(request: Request, response: Response, ticker: str = Query(default="KO")):
     ticker = validate_ticker(ticker)
     try:
         info = predictor.get_model_info(ticker)
+        # Model metadata only changes on retrain
+        not_modified = _check_etag(request, response, f"{ticker}:{info['trained_on']}")
+        if not_modified is not None:
+            return not_modified
         return ModelInfoResponse(**info)
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("model_info failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
 @app.get("/explain", response_model=ExplanationResponse)
 @limiter.limit("10/minute")
-def explain(request: Request, ticker: str = Query(default="KO")):
+async def explain(request: Request, ticker: str = Query(default="KO")):
     ticker = validate_ticker(ticker)
     try:
-        feature_df, price_df  = get_latest_feature_row(ticker)
-        result                = predictor.predict(ticker, feature_df)
-        sentiment             = load_latest_sentiment(ticker)
+        feature_df, price_df  = await asyncio.to_thread(get_latest_feature_row, ticker)
+        result                = await batcher.predict(ticker, feature_df)
+        sentiment             = await asyncio.to_thread(load_latest_sentiment, ticker)
         current_features      = feature_df.iloc[-1]
 
-        explanation = explain_prediction(
+        explanation = await asyncio.to_thread(explain_prediction,
             ticker           = ticker,
             prediction       = result["prediction"],
             confidence       = result["confidence"],
@@ -272,37 +385,40 @@ def explain(request: Request, ticker: str = Query(default="KO")):
             analogies       = explanation["analogies"],
         )
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("explain failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 @app.post("/hypothesis")
-def hypothesis(request: HypothesisRequest):
+async def hypothesis(request: HypothesisRequest):
     text = request.text.strip()
     if not text:
         raise HTTPException(status_code=400, detail="Hypothesis text cannot be empty.")
 
     try:
         # Agent 1 — Parse
-        parsed = parse_hypothesis(text)
+        parsed = await asyncio.to_thread(parse_hypothesis, text)
         if parsed.get("error"):
             raise HTTPException(status_code=400, detail=parsed["error"])
 
         ticker = parsed["ticker"]
         company_name = TICKER_FULL_NAME.get(ticker, ticker)
 
-        # Agents 2-5 run in sequence
-        market   = collect_market_context(ticker)
-        evidence = collect_historical_evidence(
-            ticker,
-            parsed.get("implied_return_pct"),
-            parsed.get("timeframe_days", 90),
+        # Agents 2-5 are independent once parsed is known — run them
+        # concurrently so latency is max(agent) instead of the sum
+        market, evidence, bear, bull = await asyncio.gather(
+            asyncio.to_thread(collect_market_context, ticker),
+            asyncio.to_thread(
+                collect_historical_evidence,
+                ticker,
+                parsed.get("implied_return_pct"),
+                parsed.get("timeframe_days", 90),
+            ),
+            asyncio.to_thread(collect_bear_case, ticker, company_name),
+            asyncio.to_thread(collect_bull_case, ticker, company_name),
         )
-        bear = collect_bear_case(ticker, company_name)
-        bull = collect_bull_case(ticker, company_name)
 
         # Agent 6 — Synthesize
-        brief = synthesize(parsed, market, evidence, bear, bull)
+        brief = await asyncio.to_thread(synthesize, parsed, market, evidence, bear, bull)
 
         if "error" in brief and not brief.get("hypothesis_clean"):
             raise HTTPException(status_code=500, detail=brief["error"])
@@ -312,15 +428,14 @@ def hypothesis(request: HypothesisRequest):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("hypothesis failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 # ── Subscriber Endpoints 
 
 @app.post("/subscribe")
 @limiter.limit("3/minute")
-def subscribe(request: Request, body: dict):
+async def subscribe(request: Request, body: dict):
     """
     User submits Telegram username + optionally their chat ID.
     If chat ID provided → auto-approved immediately + welcome message sent.
@@ -334,32 +449,13 @@ def subscribe(request: Request, body: dict):
 
     telegram_id = body.get("telegram_id", "").strip() or None
 
-    result = add_subscriber(username, telegram_id)
+    # Blocking psycopg2 round-trip — off the event loop
+    result = await asyncio.to_thread(add_subscriber, username, telegram_id)
 
-    # Send welcome message immediately on auto-approve
+    # Send welcome message immediately on auto-approve — fire-and-forget
+    # so the HTTP response doesn't wait on the Telegram round-trip
     if result.get("status") == "approved" and telegram_id:
-        try:
-            import asyncio
-            from telegram import Bot
-            token = os.getenv("TELEGRAM_BOT_TOKEN")
-            async def _welcome():
-                bot = Bot(token=token)
-                await bot.send_message(
-                    chat_id    = telegram_id,
-                    text       = (
-                        "🤖 <b>TradeSenpai Alerts — You're in!</b>\n\n"
-                        "You'll now receive:\n"
-                        "• 🌅 Morning brief (9:30 AM ET)\n"
-                        "• 🌆 Evening outcomes (4:15 PM ET)\n"
-                        "• 🔄 Direction flip alerts\n"
-                        "• 📄 Sentiment spike alerts\n\n"
-                        "⚠️ <i>Educational simulation only. Not financial advice.</i>"
-                    ),
-                    parse_mode = "HTML",
-                )
-            asyncio.run(_welcome())
-        except Exception as e:
-            print(f"[WARN] Welcome message failed: {e}")
+        _spawn(send_welcome(telegram_id, "You're in!"))
 
     return result
 
@@ -371,7 +467,7 @@ def list_subscribers(admin: str = Depends(require_admin)):
 
 
 @app.post("/subscribers/{sub_id}/approve")
-def approve(sub_id: int, body: dict, admin: str = Depends(require_admin)):
+async def approve(sub_id: int, body: dict, admin: str = Depends(require_admin)):
     """
     Admin approves a subscriber by providing their Telegram chat ID.
     Admin gets chat ID by asking the user to message the bot
@@ -380,34 +476,13 @@ def approve(sub_id: int, body: dict, admin: str = Depends(require_admin)):
     telegram_id = str(body.get("telegram_id", "")).strip()
     if not telegram_id:
         raise HTTPException(status_code=400, detail="telegram_id required.")
-    result = approve_subscriber(sub_id, telegram_id)
+    # Blocking psycopg2 round-trip — off the event loop
+    result = await asyncio.to_thread(approve_subscriber, sub_id, telegram_id)
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
 
     # Send welcome message to the newly approved subscriber
-    from alerts.telegram_bot import send_message as _send
-    try:
-        import asyncio
-        from telegram import Bot
-        token = os.getenv("TELEGRAM_BOT_TOKEN")
-        async def _welcome():
-            bot = Bot(token=token)
-            await bot.send_message(
-                chat_id    = telegram_id,
-                text       = (
-                    "🤖 <b>TradeSenpai Alerts — Approved!</b>\n\n"
-                    "You'll now receive:\n"
-                    "• 🌅 Morning brief (9:30 AM ET)\n"
-                    "• 🌆 Evening outcomes (4:15 PM ET)\n"
-                    "• 🔄 Direction flip alerts\n"
-                    "• 📄 Sentiment spike alerts\n\n"
-                    "⚠️ <i>Educational simulation only. Not financial advice.</i>"
-                ),
-                parse_mode = "HTML",
-            )
-        asyncio.run(_welcome())
-    except Exception as e:
-        print(f"[WARN] Welcome message failed: {e}")
+    _spawn(send_welcome(telegram_id, "Approved!"))
 
     return result
 
@@ -426,67 +501,75 @@ def hypothesis_stream(request: Request, body: HypothesisRequest):
     if not text:
         raise HTTPException(status_code=400, detail="Empty hypothesis.")
 
-    def event_stream():
+    async def event_stream():
         def emit(step: int, status: str, data: dict = {}):
             payload = json.dumps({"step": step, "status": status, **data})
-            yield f"data: {payload}\n\n"
+            return f"data: {payload}\n\n"
 
         try:
             # Agent 1
-            yield from emit(1, "running")
-            parsed = parse_hypothesis(text)
+            yield emit(1, "running")
+            parsed = await asyncio.to_thread(parse_hypothesis, text)
             if parsed.get("error"):
-                yield from emit(1, "error", {"message": parsed["error"]})
+                yield emit(1, "error", {"message": parsed["error"]})
                 return
-            yield from emit(1, "done", {"ticker": parsed["ticker"]})
+            yield emit(1, "done", {"ticker": parsed["ticker"]})
 
             ticker       = parsed["ticker"]
             company_name = TICKER_FULL_NAME.get(ticker, ticker)
 
-            # Agent 2
-            yield from emit(2, "running")
-            market = collect_market_context(ticker)
-            yield from emit(2, "done", {
-                "price": market.get("current_price"),
-                "rsi":   market.get("signals", {}).get("rsi_14"),
-            })
-
-            # Agent 3
-            yield from emit(3, "running")
-            evidence = collect_historical_evidence(
-                ticker,
-                parsed.get("implied_return_pct"),
-                parsed.get("timeframe_days", 90),
-            )
-            yield from emit(3, "done", {
-                "base_rate": evidence.get("base_rates", {}).get("base_rate_for_implied")
-            })
-
-            # Agent 4
-            yield from emit(4, "running")
-            bear = collect_bear_case(ticker, company_name)
-            yield from emit(4, "done", {
-                "risks_found": len(bear.get("risks", []))
-            })
-
-            # Agent 5
-            yield from emit(5, "running")
-            bull = collect_bull_case(ticker, company_name)
-            yield from emit(5, "done", {
-                "catalysts_found": len(bull.get("catalysts", []))
-            })
+            # Agents 2-5 are independent — run them concurrently and emit
+            # each "done" event as its agent resolves
+            tasks = {
+                2: asyncio.create_task(asyncio.to_thread(collect_market_context, ticker)),
+                3: asyncio.create_task(asyncio.to_thread(
+                    collect_historical_evidence,
+                    ticker,
+                    parsed.get("implied_return_pct"),
+                    parsed.get("timeframe_days", 90),
+                )),
+                4: asyncio.create_task(asyncio.to_thread(collect_bear_case, ticker, company_name)),
+                5: asyncio.create_task(asyncio.to_thread(collect_bull_case, ticker, company_name)),
+            }
+            summaries = {
+                2: lambda market: {
+                    "price": market.get("current_price"),
+                    "rsi":   market.get("signals", {}).get("rsi_14"),
+                },
+                3: lambda evidence: {
+                    "base_rate": evidence.get("base_rates", {}).get("base_rate_for_implied")
+                },
+                4: lambda bear: {"risks_found": len(bear.get("risks", []))},
+                5: lambda bull: {"catalysts_found": len(bull.get("catalysts", []))},
+            }
+            for step in tasks:
+                yield emit(step, "running")
+
+            step_of = {task: step for step, task in tasks.items()}
+            pending = set(tasks.values())
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    step = step_of[task]
+                    yield emit(step, "done", summaries[step](task.result()))
+
+            market   = tasks[2].result()
+            evidence = tasks[3].result()
+            bear     = tasks[4].result()
+            bull     = tasks[5].result()
 
             # Agent 6
-            yield from emit(6, "running")
-            brief = synthesize(parsed, market, evidence, bear, bull)
-            yield from emit(6, "done")
+            yield emit(6, "running")
+            brief = await asyncio.to_thread(synthesize, parsed, market, evidence, bear, bull)
+            yield emit(6, "done")
 
             # Final result
             yield f"data: {json.dumps({'step': 0, 'status': 'complete', 'brief': brief})}\n\n"
 
         except Exception as e:
-            import traceback
-            print(traceback.format_exc())
+            log.exception("hypothesis_stream failed")
             yield f"data: {json.dumps({'step': 0, 'status': 'error', 'message': 'Analysis failed. Please try again.'})}\n\n"
 
     return StreamingResponse(
@@ -567,8 +650,7 @@ def anomaly_history(ticker: str = Query(default=None)):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("anomaly_history failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
  
  
@@ -631,8 +713,7 @@ def evidence_cases():
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("evidence_cases failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 @app.get("/filing-list")
@@ -643,8 +724,7 @@ def filing_list(ticker: str = Query(default="JNJ")):
         filings = get_recent_filings(ticker)
         return {"ticker": ticker, "filings": filings}
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("filing_list failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
@@ -664,9 +744,8 @@ def filing_viewer(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        import traceback
         tb = traceback.format_exc()
-        print(tb)
+        log.exception("filing_viewer failed")
         raise HTTPException(status_code=500, detail=str(e) + " || " + tb[-300:])
 
 @app.get("/prediction-history")
@@ -743,8 +822,7 @@ def prediction_history(ticker: str = Query(default="AAPL")):
         }
 
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        log.exception("prediction_history failed")
         raise HTTPException(status_code=500, detail="Internal server error.")
         
 @app.get("/tickers")
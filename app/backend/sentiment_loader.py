@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from pathlib import Path
 
 # Base path 
@@ -10,57 +11,107 @@ def _get_sentiment_csv(ticker: str) -> Path:
     return BASE_PATH / ticker / "sec_sentiment_features.csv"
 
 
+# Source columns the loaders actually project — lets the parquet read
+# skip everything else
+_SOURCE_COLS = [
+    "date", "form_type",
+    "lm_positive", "lm_negative", "lm_uncertain", "lm_litigious",
+    "lm_constraining", "lm_pos_pct", "lm_neg_pct", "lm_uncertain_pct",
+    "lm_sentiment_score",
+]
+
+
+def _rolling_mean(a: np.ndarray, window: int) -> np.ndarray:
+    """Cumsum-based moving mean (min_periods=1 semantics) — one pass over
+    the array instead of pandas rolling machinery per call."""
+    c = np.cumsum(a, dtype=np.float64)
+    out = c.copy()
+    out[window:] -= c[:-window]
+    return out / np.minimum(np.arange(1, a.size + 1), window)
+
+
+def _rolling_std(a: np.ndarray, window: int) -> np.ndarray:
+    """Matching moving sample std (ddof=1); single-element windows yield
+    NaN like pandas rolling().std()."""
+    n  = np.minimum(np.arange(1, a.size + 1), window).astype(np.float64)
+    c  = np.cumsum(a,     dtype=np.float64)
+    c2 = np.cumsum(a * a, dtype=np.float64)
+    s  = c.copy();  s[window:]  -= c[:-window]
+    s2 = c2.copy(); s2[window:] -= c2[:-window]
+    var = np.maximum((s2 - s * s / n) / np.maximum(n - 1, 1), 0)
+    std = np.sqrt(var)
+    std[n == 1] = np.nan
+    return std
+
+
 def _compute_derived(df: pd.DataFrame) -> pd.DataFrame:
-    df["lm_sentiment_ma5"]      = df["lm_sentiment_score"].rolling(5,  min_periods=1).mean()
-    df["lm_sentiment_ma20"]     = df["lm_sentiment_score"].rolling(20, min_periods=1).mean()
-    df["lm_sentiment_delta"]    = df["lm_sentiment_score"] - df["lm_sentiment_ma20"]
-    unc_mean = df["lm_uncertain_pct"].rolling(20, min_periods=1).mean()
-    unc_std  = df["lm_uncertain_pct"].rolling(20, min_periods=1).std().replace(0, np.nan)
-    df["lm_uncertainty_zscore"] = ((df["lm_uncertain_pct"] - unc_mean) / unc_std).fillna(0)
-    lit_mean = df["lm_litigious"].rolling(20, min_periods=1).mean()
-    df["lm_litigation_spike"]   = (df["lm_litigious"] > lit_mean * 1.5).astype(int)
-    df["lm_neg_dominant"]       = (df["lm_neg_pct"] > df["lm_pos_pct"]).astype(int)
+    # All rolls operate on the same ordered frame — pull the columns out
+    # once and stay in NumPy until the final assignments
+    sent = df["lm_sentiment_score"].to_numpy(dtype=np.float64)
+    unc  = df["lm_uncertain_pct"].to_numpy(dtype=np.float64)
+    lit  = df["lm_litigious"].to_numpy(dtype=np.float64)
+
+    ma20 = _rolling_mean(sent, 20)
+    df["lm_sentiment_ma5"]   = _rolling_mean(sent, 5)
+    df["lm_sentiment_ma20"]  = ma20
+    df["lm_sentiment_delta"] = sent - ma20
+
+    unc_std = _rolling_std(unc, 20)
+    unc_std[unc_std == 0] = np.nan
+    z = (unc - _rolling_mean(unc, 20)) / unc_std
+    df["lm_uncertainty_zscore"] = np.nan_to_num(z, nan=0.0)
+
+    df["lm_litigation_spike"] = (lit > _rolling_mean(lit, 20) * 1.5).astype(int)
+    df["lm_neg_dominant"]     = (df["lm_neg_pct"].to_numpy() > df["lm_pos_pct"].to_numpy()).astype(int)
     return df
 
 
-def load_latest_sentiment(ticker: str) -> dict:
-    df = pd.read_csv(_get_sentiment_csv(ticker), parse_dates=["date"])
+@lru_cache(maxsize=32)
+def _load_sentiment_df(ticker: str, mtime: float) -> pd.DataFrame:
+    """File read + date parse + rolling stats, memoized per (ticker, mtime).
+    The mtime key means a refreshed file busts the cache automatically.
+    Prefers the parquet sidecar written by lm_sentiment.py — columnar, so
+    only the projected columns are read and no text parsing happens."""
+    csv_path = _get_sentiment_csv(ticker)
+    pq_path  = csv_path.with_suffix(".parquet")
+    if pq_path.exists() and pq_path.stat().st_mtime >= mtime:
+        df = pd.read_parquet(pq_path, columns=_SOURCE_COLS)
+    else:
+        df = pd.read_csv(csv_path, parse_dates=["date"])
     df = df.sort_values("date").reset_index(drop=True)
-    df = _compute_derived(df)
-    latest = df.iloc[-1]
+    return _compute_derived(df)
+
+
+def _sentiment_df(ticker: str) -> pd.DataFrame:
+    return _load_sentiment_df(ticker, _get_sentiment_csv(ticker).stat().st_mtime)
+
+
+# Float fields of the latest-sentiment payload — pulled in one vectorized
+# slice rather than 15 scalar lookups
+_FLOAT_COLS = [
+    "lm_sentiment_score", "lm_pos_pct", "lm_neg_pct", "lm_uncertain_pct",
+    "lm_litigious", "lm_constraining", "lm_positive", "lm_negative",
+    "lm_uncertain", "lm_sentiment_ma5", "lm_sentiment_ma20",
+    "lm_sentiment_delta", "lm_uncertainty_zscore", "lm_litigation_spike",
+    "lm_neg_dominant",
+]
+
+
+def load_latest_sentiment(ticker: str) -> dict:
+    df   = _sentiment_df(ticker)
+    vals = df[_FLOAT_COLS].iloc[-1].to_numpy(dtype=np.float64).tolist()
 
     return {
-        "date":                  str(latest["date"].date()),
-        "lm_sentiment_score":    float(latest["lm_sentiment_score"]),
-        "lm_pos_pct":            float(latest["lm_pos_pct"]),
-        "lm_neg_pct":            float(latest["lm_neg_pct"]),
-        "lm_uncertain_pct":      float(latest["lm_uncertain_pct"]),
-        "lm_litigious":          float(latest["lm_litigious"]),
-        "lm_constraining":       float(latest["lm_constraining"]),
-        "lm_positive":           float(latest["lm_positive"]),
-        "lm_negative":           float(latest["lm_negative"]),
-        "lm_uncertain":          float(latest["lm_uncertain"]),
-        "lm_sentiment_ma5":      float(latest["lm_sentiment_ma5"]),
-        "lm_sentiment_ma20":     float(latest["lm_sentiment_ma20"]),
-        "lm_sentiment_delta":    float(latest["lm_sentiment_delta"]),
-        "lm_uncertainty_zscore": float(latest["lm_uncertainty_zscore"]),
-        "lm_litigation_spike":   float(latest["lm_litigation_spike"]),
-        "lm_neg_dominant":       float(latest["lm_neg_dominant"]),
-        "form_type":             str(latest["form_type"]),
+        "date": str(df["date"].iloc[-1].date()),
+        **dict(zip(_FLOAT_COLS, vals)),
+        "form_type": str(df["form_type"].iloc[-1]),
     }
 
 
 def load_sentiment_history(ticker: str, n: int = 50) -> list[dict]:
-    df = pd.read_csv(_get_sentiment_csv(ticker), parse_dates=["date"])
-    df = df.sort_values("date").tail(n).reset_index(drop=True)
-
-    return [
-        {
-            "date":               str(row["date"].date()),
-            "lm_sentiment_score": float(row["lm_sentiment_score"]),
-            "lm_neg_pct":         float(row["lm_neg_pct"]),
-            "lm_uncertain_pct":   float(row["lm_uncertain_pct"]),
-            "form_type":          str(row["form_type"]),
-        }
-        for _, row in df.iterrows()
-    ]
\ No newline at end of file
+    # Columnar build — no per-row Series boxing via iterrows
+    sub = _sentiment_df(ticker)[
+        ["date", "lm_sentiment_score", "lm_neg_pct", "lm_uncertain_pct", "form_type"]
+    ].tail(n).copy()
+    sub["date"] = sub["date"].dt.strftime("%Y-%m-%d")
+    return sub.to_dict("records")
\ No newline at end of file
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
+from functools import lru_cache
 from pathlib import Path
-from sklearn.preprocessing import StandardScaler
 
 # Path to processed data
 BASE_PATH = Path(__file__).resolve().parent.parent.parent / "stock-analysis" / "data" / "processed"
@@ -41,26 +41,52 @@ SIGNAL_LABELS = {
 }
 
 
-def _cosine_similarity_matrix(query: np.ndarray,
-                               matrix: np.ndarray) -> np.ndarray:
-    """
-    Computes cosine similarity between a single query vector
-    and every row in a matrix.
+@lru_cache(maxsize=8)
+def _load_merged_dataset(ticker: str, mtime: float) -> pd.DataFrame:
+    """Merged-dataset read + date parse, memoized per (ticker, mtime) so
+    repeat queries skip the file entirely until it is regenerated.
+    Prefers the parquet sidecar written by merge_datasets.py — typed
+    columnar load, no date parsing."""
+    csv_path = BASE_PATH / ticker / "merged_dataset.csv"
+    pq_path  = csv_path.with_suffix(".parquet")
+    if pq_path.exists() and pq_path.stat().st_mtime >= mtime:
+        df = pd.read_parquet(pq_path)
+    else:
+        df = pd.read_csv(csv_path, parse_dates=["date"])
+    df = df.sort_values("date").reset_index(drop=True)
+    return df.dropna(subset=["next_day_return", "target_direction"])
+
 
-    query:  shape (n_features,)
-    matrix: shape (n_samples, n_features)
-    returns: shape (n_samples,)
+@lru_cache(maxsize=8)
+def _load_similarity_matrix(ticker: str, mtime: float, cutoff: str, avail: tuple):
     """
-    # Normalize query
-    query_norm  = query / (np.linalg.norm(query) + 1e-10)
+    Precomputes everything about the historical side of the similarity
+    query: NaN-filled feature matrix, standardization stats, and
+    L2-normalized rows. Keyed on (ticker, mtime, cutoff date, snapshot
+    feature set) so each query reduces to scaling + normalizing the
+    current vector and one BLAS matvec; the snapshot's features come
+    from the same pipeline every time, so the extra key component stays
+    stable and cache hits are unaffected. float32 throughout — the
+    compute is memory-bound.
+    """
+    df = _load_merged_dataset(ticker, mtime)
+    df_historical = df[df["date"] < pd.Timestamp(cutoff)].reset_index(drop=True)
+
+    features = [f for f in avail if f in df_historical.columns]
+    X = df_historical[features].to_numpy(dtype=np.float32)
+
+    # Replace NaN with column means in one vectorized pass to avoid
+    # similarity collapse
+    X = np.where(np.isnan(X), np.nanmean(X, axis=0), X)
 
-    # Normalize each row of matrix
-    row_norms   = np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-10
-    matrix_norm = matrix / row_norms
+    # Standardize in place of a StandardScaler re-fit per query
+    mean = X.mean(axis=0, dtype=np.float32)
+    std  = X.std(axis=0, dtype=np.float32)
+    std[std == 0] = 1.0
 
-    # Dot product → cosine similarity
-    similarities = matrix_norm @ query_norm
-    return similarities
+    X_scaled = (X - mean) / std
+    X_norm   = X_scaled / (np.linalg.norm(X_scaled, axis=1, keepdims=True) + 1e-10)
+    return df_historical, features, X_norm, mean, std
 
 
 def find_similar_days(
@@ -89,18 +115,21 @@ def find_similar_days(
         - actual next day return
         - key signals
     """
-    # ── Load historical dataset 
+    # ── Load historical dataset
     csv_path = BASE_PATH / ticker / "merged_dataset.csv"
     if not csv_path.exists():
         raise FileNotFoundError(f"No merged dataset found for {ticker}")
 
-    df = pd.read_csv(csv_path, parse_dates=["date"])
-    df = df.sort_values("date").reset_index(drop=True)
-    df = df.dropna(subset=["next_day_return", "target_direction"])
-
-    # ── Filter out recent days 
+    # ── Filter out recent days — cutoff keyed by date so the memoized
+    # matrix stays valid within a day
     cutoff_date = pd.Timestamp.today() - pd.Timedelta(days=min_days_ago)
-    df_historical = df[df["date"] < cutoff_date].reset_index(drop=True)
+    # Only compare over features the snapshot actually carries — a feature
+    # missing from the snapshot must drop out of both sides, not become a
+    # zero that standardization turns into a large z-score
+    avail = tuple(f for f in SIMILARITY_FEATURES if f in current_features.index)
+    df_historical, features, X_norm, mean, std = _load_similarity_matrix(
+        ticker, csv_path.stat().st_mtime, str(cutoff_date.date()), avail
+    )
 
     if len(df_historical) < top_n:
         raise ValueError(
@@ -108,34 +137,21 @@ def find_similar_days(
             f"(need {top_n}, got {len(df_historical)})"
         )
 
-    # ── Select features 
-    available_features = [
-        f for f in SIMILARITY_FEATURES
-        if f in df_historical.columns and f in current_features.index
-    ]
-
-    X_historical = df_historical[available_features].values.astype(float)
-    x_current    = current_features[available_features].values.astype(float)
-
-    # ── Handle NaN in historical data 
-    # Replace NaN with column mean to avoid similarity collapse
-    col_means    = np.nanmean(X_historical, axis=0)
-    nan_mask     = np.isnan(X_historical)
-    X_historical[nan_mask] = np.take(col_means, np.where(nan_mask)[1])
-
-    # Replace NaN in current vector with 0
+    # ── Current vector — every feature here is present in the snapshot by
+    # construction; NaN values fall back to 0, matching the old handling
+    x_current = current_features.reindex(features).to_numpy(dtype=np.float32)
     x_current = np.nan_to_num(x_current, nan=0.0)
 
-    # ── Normalize (StandardScaler) 
-    scaler       = StandardScaler()
-    X_scaled     = scaler.fit_transform(X_historical)
-    x_curr_scaled = scaler.transform(x_current.reshape(1, -1)).squeeze()
-
-    # ── Compute cosine similarity 
-    similarities = _cosine_similarity_matrix(x_curr_scaled, X_scaled)
+    # ── Scale, normalize, and compare against the precomputed rows
+    x_curr_scaled = (x_current - mean) / std
+    q_norm        = x_curr_scaled / (np.linalg.norm(x_curr_scaled) + 1e-10)
+    similarities  = X_norm @ q_norm
 
-    # ── Get top N indices 
-    top_indices  = np.argsort(similarities)[::-1][:top_n]
+    # ── Get top N indices — argpartition is O(N); only the tiny top_n
+    # tail gets sorted. kth = top_n - 1 keeps it in bounds when the
+    # history has exactly top_n rows
+    part        = np.argpartition(-similarities, top_n - 1)[:top_n]
+    top_indices = part[np.argsort(-similarities[part])]
 
     # ── Build result 
     results = []
@@ -1,9 +1,11 @@
+import os
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from config import TICKERS, FILING_TYPES, raw_dir, filings_index_path
 import re
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from sec_edgar_downloader import Downloader
 
 import argparse
@@ -18,6 +20,9 @@ DOWNLOAD_DIR = raw_dir(TICKER)
 INDEX_CSV    = filings_index_path(TICKER)
 EMAIL        = "tradesenpai@email.com"
 
+# Compiled once — parse_filing_date runs per accession dir
+_FILED_AS_OF_RE = re.compile(rb"\s+(\d{8})")
+
 # Download all the filings
 def download_all_filings():
     dl = Downloader(COMPANY_NAME, EMAIL, DOWNLOAD_DIR)
@@ -48,12 +53,18 @@ def parse_filing_date(filing_dir: Path) -> str | None:
     if not submission_file.exists():
         return None
 
-    content = submission_file.read_text(encoding="utf-8", errors="replace")
+    # The marker sits in the SGML header near the top of the file — read
+    # only the first 8 KB as bytes instead of UTF-8 decoding multi-MB
+    # submissions just to regex the whole thing
+    with open(submission_file, "rb") as f:
+        head = f.read(8192)
 
-    match = re.search(r"FILED AS OF DATE:\s+(\d{8})", content)
-    if match:
-        raw = match.group(1)                          # e.g. "20000126"
-        return f"{raw[:4]}-{raw[4:6]}-{raw[6:]}"     # → "2000-01-26"
+    i = head.find(b"FILED AS OF DATE:")
+    if i != -1:
+        match = _FILED_AS_OF_RE.match(head[i + 17:])
+        if match:
+            raw = match.group(1).decode()                # e.g. "20000126"
+            return f"{raw[:4]}-{raw[4:6]}-{raw[6:]}"     # → "2000-01-26"
 
     return None
 
@@ -62,19 +73,44 @@ def find_primary_document(filing_dir: Path) -> Path | None:
     Handles both newer filings (with extension) and older ones (no extension).
     Falls back to full-submission.txt if nothing else found.
     """
+    # One scandir instead of up to five exists() stats per accession dir
+    with os.scandir(filing_dir) as it:
+        names = {e.name for e in it if e.is_file()}
+
     for name in ["primary-document.html", "primary-document.htm",
                  "primary-document.txt", "primary-document"]:
-        candidate = filing_dir / name
-        if candidate.exists():
-            return candidate
+        if name in names:
+            return filing_dir / name
 
     # Last resort fallback
-    fallback = filing_dir / "full-submission.txt"
-    if fallback.exists():
-        return fallback
+    if "full-submission.txt" in names:
+        return filing_dir / "full-submission.txt"
 
     return None
 
+def _process_accession(acc_dir: Path, filing_type: str) -> dict | None:
+    """Parses one accession directory into an index record, or None if the
+    date or primary document can't be found."""
+    accession_number = acc_dir.name
+
+    date = parse_filing_date(acc_dir)
+    if not date:
+        print(f"  [WARN] Could not parse date for {accession_number} — skipping")
+        return None
+
+    primary_doc = find_primary_document(acc_dir)
+    if not primary_doc:
+        print(f"  [WARN] No primary document for {accession_number} — skipping")
+        return None
+
+    return {
+        "date":             date,
+        "form_type":        filing_type,
+        "accession_number": accession_number,
+        "file_path":        str(primary_doc)
+    }
+
+
 def build_filings_index() -> pd.DataFrame:
     """
     Walks the sec_edgar_downloader output structure and builds a clean index:
@@ -83,36 +119,22 @@ def build_filings_index() -> pd.DataFrame:
     base = DOWNLOAD_DIR / "sec-edgar-filings" / TICKER
     records = []
 
-    for filing_type in FILING_TYPES:
-        type_dir = base / filing_type
-        if not type_dir.exists():
-            print(f"[WARN] No Directory found for {filing_type} at {type_dir}")
-            continue
-
-        accession_dirs = [d for d in type_dir.iterdir() if d.is_dir()]
-        print(f"[INDEX] {filing_type}: {len(accession_dirs)} filings found")
-
-        for acc_dir in accession_dirs:
-            accession_number = acc_dir.name
-
-            # Get data from filing-details.xml
-            date = parse_filing_date(acc_dir)
-            if not date:
-                print(f"  [WARN] Could not parse date for {accession_number} — skipping")
+    # Each accession is independent file I/O — fan out on threads instead
+    # of opening thousands of small files back-to-back
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for filing_type in FILING_TYPES:
+            type_dir = base / filing_type
+            if not type_dir.exists():
+                print(f"[WARN] No Directory found for {filing_type} at {type_dir}")
                 continue
 
-            # Get primary document path
-            primary_doc = find_primary_document(acc_dir)
-            if not primary_doc:
-                print(f"  [WARN] No primary document for {accession_number} — skipping")
-                continue
+            accession_dirs = [d for d in type_dir.iterdir() if d.is_dir()]
+            print(f"[INDEX] {filing_type}: {len(accession_dirs)} filings found")
 
-            records.append({
-                "date":             date,
-                "form_type":        filing_type,
-                "accession_number": accession_number,
-                "file_path":        str(primary_doc)
-            })
+            results = executor.map(
+                _process_accession, accession_dirs, [filing_type] * len(accession_dirs)
+            )
+            records.extend(r for r in results if r is not None)
 
     df = pd.DataFrame(records)
     if df.empty:
@@ -10,21 +10,60 @@ from config import TICKERS, cleaned_prices_path
 
 import argparse
 parser = argparse.ArgumentParser()
-parser.add_argument("--ticker", required=True, choices=list(TICKERS.keys()))
+parser.add_argument("--ticker", choices=list(TICKERS.keys()))
+parser.add_argument("--all", action="store_true",
+                    help="fetch every ticker in one batched download")
 args   = parser.parse_args()
 
+if not args.all and not args.ticker:
+    parser.error("--ticker or --all is required")
+
 TICKER = args.ticker
 
-def fetch_and_engineer(ticker: str) -> pd.DataFrame:
-    print(f"[INFO] Downloading {ticker} price data...")
-    df = yf.download(ticker, start="1994-01-01", end=datetime.today().strftime("%Y-%m-%d"), progress=False)
 
-    df = df.reset_index()
+def _move_mean(a: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean over full windows (NaN head, like rolling(N).mean())
+    computed from one cumulative sum. Leading NaNs — e.g. the first
+    pct_change row — are skipped the way pandas skips them."""
+    start = int(np.argmax(~np.isnan(a))) if np.isnan(a[:1]).any() else 0
+    out   = np.full(a.size, np.nan)
+    tail  = a[start:]
+    if tail.size >= window:
+        c = np.cumsum(tail, dtype=np.float64)
+        out[start + window - 1:] = (
+            c[window - 1:] - np.concatenate(([0.0], c[:-window]))
+        ) / window
+    return out
+
+
+def _move_std(a: np.ndarray, window: int) -> np.ndarray:
+    """Matching rolling sample std (ddof=1) from cumulative sums."""
+    start = int(np.argmax(~np.isnan(a))) if np.isnan(a[:1]).any() else 0
+    out   = np.full(a.size, np.nan)
+    tail  = a[start:]
+    if tail.size >= window:
+        c  = np.cumsum(tail,        dtype=np.float64)
+        c2 = np.cumsum(tail * tail, dtype=np.float64)
+        s  = c[window - 1:]  - np.concatenate(([0.0], c[:-window]))
+        s2 = c2[window - 1:] - np.concatenate(([0.0], c2[:-window]))
+        var = np.maximum((s2 - s * s / window) / (window - 1), 0)
+        out[start + window - 1:] = np.sqrt(var)
+    return out
+
+
+def fetch_and_engineer(ticker: str, raw: pd.DataFrame | None = None) -> pd.DataFrame:
+    if raw is None:
+        print(f"[INFO] Downloading {ticker} price data...")
+        raw = yf.download(ticker, start="1994-01-01", end=datetime.today().strftime("%Y-%m-%d"), progress=False)
+
+    df = raw.reset_index()
     df.columns = [c[0].lower() if isinstance(c, tuple) else c.lower() for c in df.columns]
     df = df.rename(columns={"price": "close"}) if "price" in df.columns else df
     df = df[["date", "open", "high", "low", "close", "volume"]].copy()
     df = df.dropna().reset_index(drop=True)
-    df["date"] = pd.to_datetime(df["date"]).dt.date.astype(str)
+    # Keep date as datetime64 throughout — stringifying here just forced a
+    # re-parse before the calendar features; to_csv formats it on write
+    df["date"] = pd.to_datetime(df["date"]).dt.normalize()
 
     print(f"[INFO] Engineering features for {ticker}...")
 
@@ -37,18 +76,24 @@ def fetch_and_engineer(ticker: str) -> pd.DataFrame:
     df["close_lag5"]  = df["close"].shift(5)
     df["close_lag10"] = df["close"].shift(10)
 
+    # All the rolling features run on three base arrays — pull them out
+    # once and use the cumsum kernels instead of pandas rolling machinery
+    close  = df["close"].to_numpy(np.float64)
+    volume = df["volume"].to_numpy(np.float64)
+    dret   = df["daily_return"].to_numpy(np.float64)
+
     # ── Moving averages ──
-    df["ma_7"]   = df["close"].rolling(7).mean()
-    df["ma_20"]  = df["close"].rolling(20).mean()
-    df["ma_50"]  = df["close"].rolling(50).mean()
-    df["ma_200"] = df["close"].rolling(200).mean()
+    df["ma_7"]   = _move_mean(close, 7)
+    df["ma_20"]  = _move_mean(close, 20)
+    df["ma_50"]  = _move_mean(close, 50)
+    df["ma_200"] = _move_mean(close, 200)
 
     # ── Volatility ──
-    df["volatility_20"] = df["daily_return"].rolling(20).std()
-    df["volatility_30"] = df["daily_return"].rolling(30).std()
+    df["volatility_20"] = _move_std(dret, 20)
+    df["volatility_30"] = _move_std(dret, 30)
 
     # ── Volume ──
-    df["avg_volume_20"]   = df["volume"].rolling(20).mean()
+    df["avg_volume_20"]   = _move_mean(volume, 20)
     df["volume_ratio_20"] = df["volume"] / df["avg_volume_20"]
 
     # ── Momentum ──
@@ -56,30 +101,30 @@ def fetch_and_engineer(ticker: str) -> pd.DataFrame:
     df["momentum_10d"] = df["close"].pct_change(10) * 100
 
     # ── Bollinger Bands ──
-    std_20 = df["close"].rolling(20).std()
+    std_20 = _move_std(close, 20)
     df["distance_from_ma20"] = ((df["close"] - df["ma_20"]) / df["ma_20"]) * 100
     df["distance_from_ma50"] = ((df["close"] - df["ma_50"]) / df["ma_50"]) * 100
     df["upper_band_20"]      = df["ma_20"] + (2 * std_20)
     df["lower_band_20"]      = df["ma_20"] - (2 * std_20)
 
     # ── RSI ──
-    delta = df["close"].diff()
-    gain  = delta.clip(lower=0).rolling(14).mean()
-    loss  = (-delta.clip(upper=0)).rolling(14).mean()
-    rs    = gain / loss.replace(0, np.nan)
+    delta = np.diff(close, prepend=np.nan)
+    gain  = _move_mean(np.clip(delta, 0, None), 14)
+    loss  = _move_mean(-np.clip(delta, None, 0), 14)
+    rs    = gain / np.where(loss == 0, np.nan, loss)
     df["rsi_14"] = 100 - (100 / (1 + rs))
 
     # ── Calendar ──
-    df["date"]        = pd.to_datetime(df["date"])
     df["day_of_week"] = df["date"].dt.dayofweek
     df["month"]       = df["date"].dt.month
     df["quarter"]     = df["date"].dt.quarter
 
     # ── Market regime ──
-    df["market_regime"] = df["close"].apply(
-        lambda x: "bullish" if x > df["ma_200"].mean() else "bearish"
+    df["market_regime"] = (
+        (df["close"] > df["ma_200"])
+        .map({True: "bullish", False: "bearish"})
+        .astype("category")
     )
-    df["market_regime"] = (df["close"] > df["ma_200"]).map({True: "bullish", False: "bearish"})
 
     # ── Target ──
     df["next_day_close"]  = df["close"].shift(-1)
@@ -94,7 +139,32 @@ def fetch_and_engineer(ticker: str) -> pd.DataFrame:
     return df
 
 
-df  = fetch_and_engineer(TICKER)
-out = cleaned_prices_path(TICKER)
-df.to_csv(out, index=False)
-print(f"[SAVED] {out}")
\ No newline at end of file
+def fetch_all():
+    """Batched path: one pooled yf.download for every ticker — amortizes
+    the HTTP round-trips and the per-process startup cost of running the
+    script once per ticker."""
+    tickers = list(TICKERS.keys())
+    print(f"[INFO] Batch downloading {len(tickers)} tickers...")
+    big = yf.download(tickers, start="1994-01-01",
+                      end=datetime.today().strftime("%Y-%m-%d"),
+                      threads=True, group_by="ticker", progress=False)
+
+    for ticker in tickers:
+        df = fetch_and_engineer(ticker, raw=big[ticker].dropna(how="all"))
+        _save(df, ticker)
+
+
+def _save(df: pd.DataFrame, ticker: str):
+    out = cleaned_prices_path(ticker)
+    df.to_csv(out, index=False, date_format="%Y-%m-%d")
+    # Columnar sidecar — downstream loads skip the ASCII parse and keep
+    # real dtypes (datetime64 date, categorical regime); CSV kept for
+    # human inspection
+    df.to_parquet(out.with_suffix(".parquet"), index=False)
+    print(f"[SAVED] {out}")
+
+
+if args.all:
+    fetch_all()
+else:
+    _save(fetch_and_engineer(TICKER), TICKER)
\ No newline at end of file
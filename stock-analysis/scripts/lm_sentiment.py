@@ -1,7 +1,10 @@
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import re
+from collections import Counter
+from sklearn.feature_extraction.text import CountVectorizer
 
 sys.path.append(str(Path(__file__).parent))
 from config import sentiment_input_path, sentiment_features_path
@@ -18,7 +21,7 @@ OUTPUT_CSV = sentiment_features_path(args.ticker)
 # Source: https://sraf.nd.edu/loughranmcdonald-master-dictionary/
 # These are the core word lists from the 2011 paper
 # "When Is a Liability Not a Liability?" — Journal of Finance
-LM_POSITIVE = {
+LM_POSITIVE = frozenset({
     "able", "abundant", "acclaimed", "achieve", "acumen", "adaptable",
     "adequate", "admirable", "advancement", "advantage", "advantaged",
     "beneficial", "best", "better", "bolster", "boom", "breakthrough",
@@ -38,9 +41,9 @@ LM_POSITIVE = {
     "strategic", "streamline", "strength", "strengthen", "strong",
     "success", "successful", "superior", "sustainable", "transformative",
     "upward", "valuable", "value", "well", "win"
-}
+})
 
-LM_NEGATIVE = {
+LM_NEGATIVE = frozenset({
     "abnormal", "adverse", "against", "allegation", "bankrupt", "below",
     "breach", "burden", "challenge", "charges", "claim", "closure",
     "complaint", "concern", "constrain", "costly", "crime", "crisis",
@@ -59,9 +62,9 @@ LM_NEGATIVE = {
     "unable", "uncertain", "underperform", "unfavorable", "unresolved",
     "unsatisfactory", "violation", "warn", "warning", "weak", "weakness",
     "worse", "writedown", "writeoff", "wrong"
-}
+})
 
-LM_UNCERTAIN = {
+LM_UNCERTAIN = frozenset({
     "allegedly", "appear", "appears", "approximately", "around",
     "assume", "assumption", "believe", "believed", "can", "concern",
     "conditional", "contingent", "could", "depend", "depends",
@@ -74,9 +77,9 @@ LM_UNCERTAIN = {
     "sometime", "suggest", "tentative", "uncertain", "uncertainty",
     "unclear", "unexpected", "unknown", "unlikely", "variable", "whether",
     "would"
-}
+})
 
-LM_LITIGIOUS = {
+LM_LITIGIOUS = frozenset({
     "adjudicate", "allegation", "allege", "alleged", "appeal", "arbitrat",
     "assert", "breach", "case", "claim", "claimant", "class action",
     "compensat", "complainant", "complaint", "comply", "contempt",
@@ -89,9 +92,9 @@ LM_LITIGIOUS = {
     "proceeding", "prosecut", "regulatory", "remedy", "sanction",
     "settlement", "statute", "subpoena", "sue", "suit", "summon",
     "testimony", "trial", "tribunal", "verdict", "violation"
-}
+})
 
-LM_CONSTRAINING = {
+LM_CONSTRAINING = frozenset({
     "binding", "bounded", "cannot", "clause", "compelled", "comply",
     "compulsory", "conditional", "confine", "constrain", "constraint",
     "contingent", "covenant", "deadline", "depend", "impose", "imposed",
@@ -99,20 +102,43 @@ LM_CONSTRAINING = {
     "must", "necessary", "obligation", "oblige", "prohibit", "require",
     "required", "requirement", "requires", "restrict", "restriction",
     "restrictive", "shall", "subject to", "threshold"
+})
+
+
+# Category name → word list, in output-column order
+_CATEGORIES = {
+    "lm_positive":     LM_POSITIVE,
+    "lm_negative":     LM_NEGATIVE,
+    "lm_uncertain":    LM_UNCERTAIN,
+    "lm_litigious":    LM_LITIGIOUS,
+    "lm_constraining": LM_CONSTRAINING,
+}
+
+# Multiword LM entries ("operating loss", "no assurance", ...) can never
+# come out of the unigram tokenizer — count them with one compiled
+# alternation scan per category that has any
+_PHRASE_RES = {
+    name: re.compile(
+        r"\b(?:%s)\b" % "|".join(map(re.escape, sorted(p for p in words if " " in p)))
+    )
+    for name, words in _CATEGORIES.items()
+    if any(" " in p for p in words)
 }
 
 
 # TOKENIZER — simple, fast, no external deps
+_TOK_RE = re.compile(r"\b[a-z][a-z\-]*[a-z]\b")
+
+
 def tokenize(text: str) -> list:
     """Lowercase and split into words, strip punctuation."""
-    text  = text.lower()
-    words = re.findall(r"\b[a-z][a-z\-]*[a-z]\b", text)
-    return words
+    return _TOK_RE.findall(text.lower())
 
 
 # SCORE ONE FILING
 def score_filing(text: str) -> dict:
-    words       = tokenize(text)
+    lowered     = text.lower()
+    words       = _TOK_RE.findall(lowered)
     total_words = len(words)
 
     if total_words == 0:
@@ -129,11 +155,22 @@ def score_filing(text: str) -> dict:
             "total_words":       0
         }
 
-    pos_count  = sum(1 for w in words if w in LM_POSITIVE)
-    neg_count  = sum(1 for w in words if w in LM_NEGATIVE)
-    unc_count  = sum(1 for w in words if w in LM_UNCERTAIN)
-    lit_count  = sum(1 for w in words if w in LM_LITIGIOUS)
-    con_count  = sum(1 for w in words if w in LM_CONSTRAINING)
+    # One Counter pass, then intersect the unique tokens with each word
+    # list — ~U unique-token checks instead of 5·N full-text scans
+    cnt  = Counter(words)
+    uniq = cnt.keys()
+    counts = {
+        name: sum(cnt[w] for w in uniq & words_)
+        for name, words_ in _CATEGORIES.items()
+    }
+    for name, phrase_re in _PHRASE_RES.items():
+        counts[name] += len(phrase_re.findall(lowered))
+
+    pos_count  = counts["lm_positive"]
+    neg_count  = counts["lm_negative"]
+    unc_count  = counts["lm_uncertain"]
+    lit_count  = counts["lm_litigious"]
+    con_count  = counts["lm_constraining"]
 
     # Normalized percentages — comparable across long and short filings
     pos_pct    = round(pos_count  / total_words * 100, 4)
@@ -158,30 +195,68 @@ def score_filing(text: str) -> dict:
     }
 
 
+def score_all_filings(texts: pd.Series) -> dict:
+    """
+    Scores every filing in one shot: a single CountVectorizer transform
+    builds the (n_docs x |vocab|) sparse count matrix, and each category
+    count is one sparse matvec against a 0/1 indicator vector. All the
+    tokenization and hashing happens in compiled code.
+    """
+    vocab = sorted(frozenset().union(*_CATEGORIES.values()))
+    # ngram_range=(1, 2) so the multiword entries in the vocabulary
+    # ("operating loss", "class action", ...) actually get counted
+    vec   = CountVectorizer(vocabulary=vocab, lowercase=True,
+                            token_pattern=_TOK_RE.pattern,
+                            ngram_range=(1, 2))
+    X = vec.transform(texts)
+
+    counts = {
+        name: np.asarray(X @ np.fromiter((w in words for w in vocab),
+                                         dtype=np.int8, count=len(vocab))).ravel()
+        for name, words in _CATEGORIES.items()
+    }
+
+    # Total words via an unrestricted vectorizer — row sums of the full
+    # count matrix
+    total = np.asarray(
+        CountVectorizer(lowercase=True, token_pattern=_TOK_RE.pattern)
+        .fit_transform(texts).sum(axis=1)
+    ).ravel()
+
+    safe_total = np.where(total > 0, total, 1)
+    pct = lambda c: np.round(np.where(total > 0, c / safe_total * 100, 0.0), 4)
+
+    return {
+        **counts,
+        "lm_pos_pct":         pct(counts["lm_positive"]),
+        "lm_neg_pct":         pct(counts["lm_negative"]),
+        "lm_uncertain_pct":   pct(counts["lm_uncertain"]),
+        "lm_sentiment_score": pct(counts["lm_positive"] - counts["lm_negative"]),
+        "total_words":        total,
+    }
+
+
 # MAIN
 def run_lm_sentiment():
     OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
 
-    df = pd.read_csv(INPUT_CSV)
+    df = pd.read_csv(INPUT_CSV, engine="pyarrow")
     print(f"[INFO] Scoring {len(df)} filings with Loughran-McDonald...")
 
-    records = []
-    for i, row in df.iterrows():
-        scores = score_filing(str(row["clean_text"]))
-        records.append({
-            "date":             row["date"],
-            "form_type":        row["form_type"],
-            "accession_number": row["accession_number"],
-            **scores
-        })
-
-        if (i + 1) % 100 == 0:
-            print(f"  [PROGRESS] {i+1}/{len(df)} scored...")
+    scores = score_all_filings(df["clean_text"].fillna("").astype(str))
 
-    output_df = pd.DataFrame(records)
+    output_df = pd.DataFrame({
+        "date":             df["date"],
+        "form_type":        df["form_type"],
+        "accession_number": df["accession_number"],
+        **scores,
+    })
     output_df["date"] = pd.to_datetime(output_df["date"])
     output_df = output_df.sort_values("date").reset_index(drop=True)
     output_df.to_csv(OUTPUT_CSV, index=False)
+    # Columnar sidecar — the backend loaders prefer this (no text parsing,
+    # reads only the columns they project); CSV kept for merge_datasets
+    output_df.to_parquet(OUTPUT_CSV.with_suffix(".parquet"), index=False)
 
     print(f"\n[DONE] Saved to {OUTPUT_CSV}")
     print(f"\n[SCORE STATS]")
@@ -14,10 +14,43 @@ PRICE_CSV     = cleaned_prices_path(args.ticker)
 SENTIMENT_CSV = sentiment_features_path(args.ticker)
 OUTPUT_CSV    = merged_dataset_path(args.ticker)
 
+def _rolling_mean(a: np.ndarray, window: int) -> np.ndarray:
+    """Cumsum-based moving mean (min_periods=1 semantics) — one pass over
+    the array instead of pandas rolling machinery per call."""
+    c = np.cumsum(a, dtype=np.float64)
+    out = c.copy()
+    out[window:] -= c[:-window]
+    return out / np.minimum(np.arange(1, a.size + 1), window)
+
+
+def _rolling_std(a: np.ndarray, window: int) -> np.ndarray:
+    """Matching moving sample std (ddof=1); single-element windows yield
+    NaN like pandas rolling().std()."""
+    n  = np.minimum(np.arange(1, a.size + 1), window).astype(np.float64)
+    c  = np.cumsum(a,     dtype=np.float64)
+    c2 = np.cumsum(a * a, dtype=np.float64)
+    s  = c.copy();  s[window:]  -= c[:-window]
+    s2 = c2.copy(); s2[window:] -= c2[:-window]
+    var = np.maximum((s2 - s * s / n) / np.maximum(n - 1, 1), 0)
+    std = np.sqrt(var)
+    std[n == 1] = np.nan
+    return std
+
+
+def _read_artifact(csv_path: Path, dtype: dict) -> pd.DataFrame:
+    """Prefers the parquet sidecar written by the upstream stage — typed
+    columnar load, no date parsing, dtypes intact — and falls back to the
+    CSV (re-casting what the text round-trip loses)."""
+    pq_path = csv_path.with_suffix(".parquet")
+    if pq_path.exists() and pq_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        return pd.read_parquet(pq_path)
+    return pd.read_csv(csv_path, parse_dates=["date"], engine="pyarrow", dtype=dtype)
+
+
 # LOAD
 def load_data():
-    price_df = pd.read_csv(PRICE_CSV, parse_dates=["date"])
-    sent_df  = pd.read_csv(SENTIMENT_CSV, parse_dates=["date"])
+    price_df = _read_artifact(PRICE_CSV, {"market_regime": "category"})
+    sent_df  = _read_artifact(SENTIMENT_CSV, {"form_type": "category"})
 
     print(f"[INFO] Price data:     {len(price_df)} rows | {price_df['date'].min().date()} → {price_df['date'].max().date()}")
     print(f"[INFO] Sentiment data: {len(sent_df)} rows  | {sent_df['date'].min().date()} → {sent_df['date'].max().date()}")
@@ -71,26 +104,32 @@ def build_daily_sentiment(sent_df: pd.DataFrame, price_df: pd.DataFrame) -> pd.D
 # Raw scores are useful but derived features
 # add more predictive power
 def engineer_sentiment_features(df: pd.DataFrame) -> pd.DataFrame:
+    # All rolls run on three base arrays — pull them out once and use the
+    # cumsum kernels instead of four pandas rolling chains
+    sent = df["lm_sentiment_score"].to_numpy(dtype=np.float64)
+    unc  = df["lm_uncertain_pct"].to_numpy(dtype=np.float64)
+    lit  = df["lm_litigious"].to_numpy(dtype=np.float64)
+
     # Rolling average sentiment — smooths noise
-    df["lm_sentiment_ma5"]  = df["lm_sentiment_score"].rolling(5,  min_periods=1).mean()
-    df["lm_sentiment_ma20"] = df["lm_sentiment_score"].rolling(20, min_periods=1).mean()
+    ma20 = _rolling_mean(sent, 20)
+    df["lm_sentiment_ma5"]  = _rolling_mean(sent, 5)
+    df["lm_sentiment_ma20"] = ma20
 
     # Sentiment delta — how much did sentiment shift from recent average?
     # Sudden drops are more predictive than absolute levels
-    df["lm_sentiment_delta"] = df["lm_sentiment_score"] - df["lm_sentiment_ma20"]
+    df["lm_sentiment_delta"] = sent - ma20
 
     # Uncertainty spike — rolling z-score of uncertainty
-    unc_mean = df["lm_uncertain_pct"].rolling(20, min_periods=1).mean()
-    unc_std  = df["lm_uncertain_pct"].rolling(20, min_periods=1).std().replace(0, np.nan)
-    df["lm_uncertainty_zscore"] = (df["lm_uncertain_pct"] - unc_mean) / unc_std
-    df["lm_uncertainty_zscore"] = df["lm_uncertainty_zscore"].fillna(0)
+    unc_std = _rolling_std(unc, 20)
+    unc_std[unc_std == 0] = np.nan
+    z = (unc - _rolling_mean(unc, 20)) / unc_std
+    df["lm_uncertainty_zscore"] = np.nan_to_num(z, nan=0.0)
 
     # Litigation spike — binary flag, litigious language above rolling mean
-    lit_mean = df["lm_litigious"].rolling(20, min_periods=1).mean()
-    df["lm_litigation_spike"] = (df["lm_litigious"] > lit_mean * 1.5).astype(int)
+    df["lm_litigation_spike"] = (lit > _rolling_mean(lit, 20) * 1.5).astype(int)
 
     # Negative dominance — is negative pct outweighing positive pct?
-    df["lm_neg_dominant"] = (df["lm_neg_pct"] > df["lm_pos_pct"]).astype(int)
+    df["lm_neg_dominant"] = (df["lm_neg_pct"].to_numpy() > df["lm_pos_pct"].to_numpy()).astype(int)
 
     return df
 
@@ -155,6 +194,8 @@ def run_merge():
     merged = merge_datasets(price_df, daily_sent)
 
     merged.to_csv(OUTPUT_CSV, index=False)
+    # Columnar sidecar for the backend loaders; CSV kept for inspection
+    merged.to_parquet(OUTPUT_CSV.with_suffix(".parquet"), index=False)
     print(f"[DONE] Saved to {OUTPUT_CSV}")
 
     quality_check(merged)